@@ -2,6 +2,17 @@
 Advent of Code 2025 - Day 1: Secret Entrance
 """
 
+import asyncio
+import os
+import stat
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import reduce
+
+import numpy as np
+
+
 def parse_rotation(line: str) -> tuple[str, int]:
     """Parse a rotation instruction into direction and distance."""
     direction = line[0]
@@ -121,6 +132,522 @@ def count_all_zeros(rotations: list[str]) -> int:
     return zero_count
 
 
+def rotations_to_distances(rotations: list[str]) -> np.ndarray:
+    """
+    Convert rotation instructions into an array of signed distances.
+    
+    Args:
+        rotations: List of rotation instructions (e.g., ['L68', 'R48'])
+        
+    Returns:
+        int64 array where left rotations are negative and right rotations positive
+    """
+    if len(rotations) == 0:
+        return np.zeros(0, dtype=np.int64)
+    
+    instructions = np.asarray(rotations)
+    distances = np.char.lstrip(instructions, 'LR').astype(np.int64)
+    is_left = np.char.startswith(instructions, 'L')
+    
+    return np.where(is_left, -distances, distances)
+
+
+def unwrapped_positions(distances: np.ndarray, start: int = 50) -> np.ndarray:
+    """
+    Compute the unwrapped dial positions before and after every rotation.
+    
+    The dial position is never reduced modulo 100 here, so the number of
+    times the dial passes 0 can be read off with floor division.
+    
+    Args:
+        distances: Signed distances as returned by rotations_to_distances
+        start: Starting position of the dial
+        
+    Returns:
+        Array of length len(distances) + 1 with the position before the first
+        rotation followed by the position after each rotation
+    """
+    positions = np.empty(len(distances) + 1, dtype=np.int64)
+    positions[0] = start
+    np.cumsum(distances, out=positions[1:])
+    positions[1:] += start
+    return positions
+
+
+def count_zeros_vectorized(rotations: list[str]) -> int:
+    """
+    Vectorized version of count_zeros.
+    
+    Args:
+        rotations: List of rotation instructions (e.g., ['L68', 'R48'])
+        
+    Returns:
+        Number of times the dial points at 0 after any rotation
+    """
+    positions = unwrapped_positions(rotations_to_distances(rotations))
+    return int(np.count_nonzero(positions[1:] % 100 == 0))
+
+
+def count_all_zeros_vectorized(rotations: list[str]) -> int:
+    """
+    Vectorized version of count_all_zeros.
+    
+    A right rotation from s to e passes every multiple of 100 in (s, e], a
+    left rotation every multiple of 100 in [e, s). Both are counted with
+    floor division on the unwrapped positions.
+    
+    Args:
+        rotations: List of rotation instructions (e.g., ['L68', 'R48'])
+        
+    Returns:
+        Total number of times the dial points at 0 during or after any rotation
+    """
+    distances = rotations_to_distances(rotations)
+    positions = unwrapped_positions(distances)
+    before = positions[:-1]
+    after = positions[1:]
+    
+    right_zeros = after // 100 - before // 100
+    left_zeros = (before - 1) // 100 - (after - 1) // 100
+    
+    return int(np.where(distances < 0, left_zeros, right_zeros).sum())
+
+
+def summarize_segment(rotations: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Summarize a segment of rotations for every possible start position.
+    
+    Every rotation counts the multiples of 100 in (low, high] of the unwrapped
+    dial positions, so starting at p instead of 0 adds [p >= 100 - high % 100]
+    and removes [p >= 100 - low % 100]. Histograms of those thresholds give the
+    counts for all 100 start positions in O(len(rotations) + 100).
+    
+    Args:
+        rotations: List of rotation instructions (e.g., ['L68', 'R48'])
+        
+    Returns:
+        Tuple of (ends, end_zeros, all_zeros), each indexed by start position:
+        - ends: Dial position after the segment
+        - end_zeros: Number of rotations ending at 0
+        - all_zeros: Number of times the dial points at 0 during or after a rotation
+    """
+    return summarize_distances(rotations_to_distances(rotations))
+
+
+def summarize_distances(distances: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Summarize a segment given as signed distances (see summarize_segment).
+    
+    Args:
+        distances: Signed distances as returned by rotations_to_distances
+        
+    Returns:
+        Tuple of (ends, end_zeros, all_zeros), each indexed by start position
+    """
+    distances = np.asarray(distances, dtype=np.int64)
+    positions = unwrapped_positions(distances, start=0)
+    before = positions[:-1]
+    after = positions[1:]
+    starts = np.arange(100, dtype=np.int64)
+    
+    ends = (starts + positions[-1]) % 100
+    end_zeros = np.bincount(-after % 100, minlength=100).astype(np.int64)
+    
+    is_left = distances < 0
+    low = np.where(is_left, after - 1, before)
+    high = np.where(is_left, before - 1, after)
+    
+    base = int((high // 100 - low // 100).sum())
+    shift = (np.bincount(100 - high % 100, minlength=101)[:100]
+             - np.bincount(100 - low % 100, minlength=101)[:100])
+    all_zeros = base + np.cumsum(shift)
+    
+    return ends, end_zeros, all_zeros
+
+
+def merge_summaries(first: tuple[np.ndarray, np.ndarray, np.ndarray],
+                    second: tuple[np.ndarray, np.ndarray, np.ndarray]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Combine the summaries of two consecutive segments (associative).
+    
+    Args:
+        first: Summary of the earlier segment
+        second: Summary of the later segment
+        
+    Returns:
+        Summary of the concatenated segment
+    """
+    first_ends, first_end_zeros, first_all_zeros = first
+    second_ends, second_end_zeros, second_all_zeros = second
+    
+    return (
+        second_ends[first_ends],
+        first_end_zeros + second_end_zeros[first_ends],
+        first_all_zeros + second_all_zeros[first_ends],
+    )
+
+
+def count_zeros_parallel(rotations: list[str], max_workers: int | None = None,
+                         chunks_per_worker: int = 4) -> tuple[int, int]:
+    """
+    Solve both parts by summarizing chunks of rotations in a process pool.
+    
+    Args:
+        rotations: List of rotation instructions (e.g., ['L68', 'R48'])
+        max_workers: Number of worker processes (defaults to the CPU count)
+        chunks_per_worker: Number of chunks to create per worker
+        
+    Returns:
+        Tuple of (part 1 answer, part 2 answer)
+    """
+    if len(rotations) == 0:
+        return 0, 0
+    
+    max_workers = max_workers or os.cpu_count() or 1
+    num_chunks = max(1, min(len(rotations), max_workers * chunks_per_worker))
+    chunk_size = -(-len(rotations) // num_chunks)
+    chunks = [rotations[i:i + chunk_size] for i in range(0, len(rotations), chunk_size)]
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        summaries = list(executor.map(summarize_segment, chunks))
+    
+    ends, end_zeros, all_zeros = reduce(merge_summaries, summaries, summarize_segment([]))
+    
+    return int(end_zeros[50]), int(all_zeros[50])
+
+
+class DialTracker:
+    """
+    Track zero counts for a sequence of rotations that is edited in place.
+    
+    Rotations are stored as signed distances in buckets of up to bucket_size
+    entries. Each bucket is a leaf of a segment tree whose nodes hold segment
+    summaries (see summarize_segment) with int8 end tables, so an edit re-summarizes one
+    bucket and re-merges the O(log n) nodes above it. Each node also counts
+    its rotations so that positions can be looked up by index.
+    """
+    
+    def __init__(self, rotations: list[str] | None = None, start: int = 50, bucket_size: int = 64):
+        """
+        Create a tracker for the given rotations.
+        
+        Args:
+            rotations: Initial rotation instructions (e.g., ['L68', 'R48'])
+            start: Starting position of the dial
+            bucket_size: Maximum number of rotations per leaf
+        """
+        self.start = start
+        self.bucket_size = bucket_size
+        self._identity = self._summarize([])
+        
+        distances = rotations_to_distances(rotations or []).tolist()
+        self._build([distances[i:i + bucket_size] for i in range(0, len(distances), bucket_size)])
+    
+    def __len__(self) -> int:
+        return self._counts[1]
+    
+    @staticmethod
+    def _summarize(bucket: list[int]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Summarize a bucket of signed distances, narrowing the 0-99 end table to int8."""
+        ends, end_zeros, all_zeros = summarize_distances(bucket)
+        return ends.astype(np.int8), end_zeros, all_zeros
+    
+    def _build(self, buckets: list[list[int]], summaries: list | None = None):
+        """Rebuild the tree from the given buckets with room to grow."""
+        if summaries is None:
+            summaries = [self._summarize(bucket) for bucket in buckets]
+        
+        size = 1
+        while size <= len(buckets):
+            size *= 2
+        
+        self._size = size
+        self._last_slot = max(len(buckets) - 1, 0)
+        self._buckets = buckets + [[] for _ in range(size - len(buckets))]
+        self._tree = [self._identity] * (2 * size)
+        self._counts = [0] * (2 * size)
+        
+        for i, (bucket, summary) in enumerate(zip(buckets, summaries)):
+            self._tree[size + i] = summary
+            self._counts[size + i] = len(bucket)
+        
+        for node in range(size - 1, 0, -1):
+            self._pull(node)
+    
+    def _pull(self, node: int):
+        """Recompute a node from its two children."""
+        self._tree[node] = merge_summaries(self._tree[2 * node], self._tree[2 * node + 1])
+        self._counts[node] = self._counts[2 * node] + self._counts[2 * node + 1]
+    
+    def _refresh(self, slot: int):
+        """Re-summarize a bucket and re-merge its ancestors."""
+        bucket = self._buckets[slot]
+        node = self._size + slot
+        self._tree[node] = self._summarize(bucket) if bucket else self._identity
+        self._counts[node] = len(bucket)
+        node //= 2
+        while node >= 1:
+            self._pull(node)
+            node //= 2
+    
+    def _locate(self, index: int) -> tuple[int, int]:
+        """Find the bucket slot and offset of the index-th rotation."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Rotation index out of range: {index}")
+        
+        node = 1
+        while node < self._size:
+            if self._counts[2 * node] > index:
+                node = 2 * node
+            else:
+                index -= self._counts[2 * node]
+                node = 2 * node + 1
+        
+        return node - self._size, index
+    
+    def append(self, rotation: str):
+        """Append a rotation to the end of the sequence."""
+        direction, distance = parse_rotation(rotation)
+        last = self._last_slot
+        
+        if len(self._buckets[last]) >= self.bucket_size:
+            last += 1
+        if last == self._size:
+            live = [slot for slot in range(self._size) if self._buckets[slot]]
+            self._build([self._buckets[slot] for slot in live],
+                        [self._tree[self._size + slot] for slot in live])
+            last = len(live)
+        
+        self._buckets[last].append(-distance if direction == 'L' else distance)
+        self._last_slot = last
+        self._refresh(last)
+    
+    def replace(self, index: int, rotation: str):
+        """Replace the index-th rotation."""
+        direction, distance = parse_rotation(rotation)
+        slot, offset = self._locate(index)
+        self._buckets[slot][offset] = -distance if direction == 'L' else distance
+        self._refresh(slot)
+    
+    def delete(self, index: int):
+        """Delete the index-th rotation."""
+        slot, offset = self._locate(index)
+        del self._buckets[slot][offset]
+        self._refresh(slot)
+    
+    def count_zeros(self) -> int:
+        """Number of times the dial points at 0 after any rotation (part 1)."""
+        return int(self._tree[1][1][self.start])
+    
+    def count_all_zeros(self) -> int:
+        """Number of times the dial points at 0 during or after any rotation (part 2)."""
+        return int(self._tree[1][2][self.start])
+
+
+def iter_rotations(input_file: str, chunk_size: int = 1 << 20):
+    """
+    Stream rotation instructions from a file without loading it into memory.
+    
+    The file is read in binary chunks and each line is parsed straight from
+    bytes. A line split across two chunks is carried over to the next one.
+    
+    Args:
+        input_file: Path to the input file
+        chunk_size: Number of bytes to read at a time
+        
+    Yields:
+        (direction, distance) tuples, e.g. ('L', 68)
+    """
+    left = ord('L')
+    carry = b''
+    
+    with open(input_file, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            
+            lines = (carry + chunk).split(b'\n')
+            carry = lines.pop()
+            
+            for line in lines:
+                line = line.strip()
+                if line:
+                    yield ('L' if line[0] == left else 'R'), int(line[1:])
+    
+    carry = carry.strip()
+    if carry:
+        yield ('L' if carry[0] == left else 'R'), int(carry[1:])
+
+
+def solve_streaming(input_file: str, chunk_size: int = 1 << 20) -> tuple[int, int]:
+    """
+    Solve both parts in a single pass over the input with constant memory.
+    
+    Args:
+        input_file: Path to the input file
+        chunk_size: Number of bytes to read at a time
+        
+    Returns:
+        Tuple of (part 1 answer, part 2 answer)
+    """
+    position = 50  # Starting position
+    end_zeros = 0
+    all_zeros = 0
+    
+    for direction, distance in iter_rotations(input_file, chunk_size):
+        all_zeros += count_zeros_during_rotation(position, direction, distance)
+        position = apply_rotation(position, direction, distance)
+        
+        if position == 0:
+            end_zeros += 1
+    
+    return end_zeros, all_zeros
+
+
+def print_update(rotations_seen: int, end_zeros: int, all_zeros: int):
+    """Default publisher for follow_rotations."""
+    print(f"Rotations: {rotations_seen}  Part 1: {end_zeros}  Part 2: {all_zeros}", flush=True)
+
+
+async def follow_rotations(reader: asyncio.StreamReader, publish=print_update,
+                           batch_size: int = 1000, interval_ms: float = 100.0,
+                           chunk_size: int = 1 << 16) -> tuple[int, int]:
+    """
+    Keep running zero counts for rotations arriving on an asyncio stream.
+    
+    Updates are published after every batch_size rotations or once
+    interval_ms has passed since the last update, whichever comes first, and
+    once more when the stream ends.
+    
+    Args:
+        reader: Stream delivering one rotation instruction per line
+        publish: Callback receiving (rotations_seen, end_zeros, all_zeros)
+        batch_size: Number of rotations between updates
+        interval_ms: Maximum time between updates while rotations are pending
+        chunk_size: Number of bytes to read at a time
+        
+    Returns:
+        Tuple of (part 1 answer, part 2 answer) when the stream ends
+    """
+    position = 50  # Starting position
+    end_zeros = 0
+    all_zeros = 0
+    rotations_seen = 0
+    pending = 0
+    interval = interval_ms / 1000
+    last_update = time.monotonic()
+    carry = b''
+    left = ord('L')
+    
+    while True:
+        timeout = max(0.0, last_update + interval - time.monotonic())
+        try:
+            chunk = await asyncio.wait_for(reader.read(chunk_size), timeout if pending else None)
+        except asyncio.TimeoutError:
+            chunk = None
+        
+        if chunk:
+            lines = (carry + chunk).split(b'\n')
+            carry = lines.pop()
+        elif chunk is not None:
+            # End of stream, process the last line even without a newline
+            lines = [carry]
+            carry = b''
+        else:
+            lines = []
+        
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            
+            direction = 'L' if line[0] == left else 'R'
+            distance = int(line[1:])
+            all_zeros += count_zeros_during_rotation(position, direction, distance)
+            position = apply_rotation(position, direction, distance)
+            if position == 0:
+                end_zeros += 1
+            
+            rotations_seen += 1
+            pending += 1
+            if pending >= batch_size:
+                publish(rotations_seen, end_zeros, all_zeros)
+                pending = 0
+                last_update = time.monotonic()
+        
+        if pending and (chunk == b'' or time.monotonic() - last_update >= interval):
+            publish(rotations_seen, end_zeros, all_zeros)
+            pending = 0
+            last_update = time.monotonic()
+        
+        if chunk == b'':
+            return end_zeros, all_zeros
+
+
+class FileStreamReader:
+    """
+    Minimal stand-in for asyncio.StreamReader over a regular file.
+    
+    Event loop pipe transports reject regular files, so reads run in the
+    default executor instead. A read interrupted by a timeout is kept and
+    returned by the next call, so no data is lost.
+    """
+    
+    def __init__(self, file):
+        self.file = file
+        self._pending = None
+    
+    async def read(self, n: int = -1) -> bytes:
+        if self._pending is None:
+            self._pending = asyncio.get_running_loop().run_in_executor(None, self.file.read, n)
+        chunk = await asyncio.shield(self._pending)
+        self._pending = None
+        return chunk
+
+
+async def open_rotation_stream(source: str) -> tuple[asyncio.StreamReader, object | None]:
+    """
+    Open a live rotation source as an asyncio stream.
+    
+    Args:
+        source: '-' for stdin, 'host:port' for a TCP socket, otherwise a path
+            to a named pipe or a regular file
+            
+    Returns:
+        Tuple of (reader, resource); the resource is the TCP writer or the
+        opened file, must be kept alive while reading and closed afterwards,
+        and is None for stdin
+    """
+    if ':' in source and not os.path.exists(source):
+        host, port = source.rsplit(':', 1)
+        return await asyncio.open_connection(host, int(port))
+    
+    pipe = sys.stdin.buffer if source == '-' else open(source, 'rb')
+    resource = None if source == '-' else pipe
+    
+    if stat.S_ISREG(os.fstat(pipe.fileno()).st_mode):
+        # e.g. `python day01.py - < input.txt`
+        return FileStreamReader(pipe), resource
+    
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), pipe)
+    return reader, resource
+
+
+async def run_live_feed(source: str, batch_size: int = 1000, interval_ms: float = 100.0) -> tuple[int, int]:
+    """Follow a live rotation source and print running counts."""
+    reader, resource = await open_rotation_stream(source)
+    try:
+        return await follow_rotations(reader, batch_size=batch_size, interval_ms=interval_ms)
+    finally:
+        if resource is not None:
+            resource.close()
+
+
 def solve_part1(input_file: str) -> int:
     """Solve part 1 of the puzzle."""
     with open(input_file, 'r') as f:
@@ -153,6 +680,39 @@ def main():
     print(f"Example Part 2: {example_result_part2}")
     assert example_result_part2 == 6, f"Expected 6, got {example_result_part2}"
     
+    # Vectorized engine must agree with the reference implementation
+    assert count_zeros_vectorized(example) == example_result_part1, "Vectorized Part 1 mismatch"
+    assert count_all_zeros_vectorized(example) == example_result_part2, "Vectorized Part 2 mismatch"
+    
+    # Segment summaries must agree regardless of how the rotations are split
+    parallel_result = count_zeros_parallel(example, max_workers=2)
+    assert parallel_result == (3, 6), f"Expected (3, 6), got {parallel_result}"
+    
+    # Incremental tracker must follow edits to the sequence
+    tracker = DialTracker(example[:5])
+    for rotation in example[5:]:
+        tracker.append(rotation)
+    assert (tracker.count_zeros(), tracker.count_all_zeros()) == (3, 6), "DialTracker mismatch"
+    
+    tracker.replace(0, 'R50')
+    tracker.delete(-1)
+    edited = ['R50'] + example[1:-1]
+    assert tracker.count_zeros() == count_zeros(edited), "DialTracker Part 1 mismatch after edits"
+    assert tracker.count_all_zeros() == count_all_zeros(edited), "DialTracker Part 2 mismatch after edits"
+    
+    # Live feed must publish batches and agree at the end of the stream
+    async def feed_example():
+        reader = asyncio.StreamReader()
+        reader.feed_data('\n'.join(example).encode())
+        reader.feed_eof()
+        updates = []
+        result = await follow_rotations(reader, lambda *update: updates.append(update), batch_size=4)
+        return result, updates
+    
+    live_result, live_updates = asyncio.run(feed_example())
+    assert live_result == (3, 6), f"Expected (3, 6), got {live_result}"
+    assert [update[0] for update in live_updates] == [4, 8, 10], f"Unexpected updates: {live_updates}"
+    
     # Solve actual puzzle
     try:
         result_part1 = solve_part1('../data/day01.txt')
@@ -160,9 +720,17 @@ def main():
         
         result_part2 = solve_part2('../data/day01.txt')
         print(f"Part 2 answer: {result_part2}")
+        
+        # Streaming mode must agree, even with chunks that split lines
+        streaming_result = solve_streaming('../data/day01.txt', chunk_size=7)
+        assert streaming_result == (result_part1, result_part2), f"Streaming mismatch: {streaming_result}"
     except FileNotFoundError:
         print("Input file not found. Please add your puzzle input to ../data/day01.txt")
 
 
 if __name__ == '__main__':
-    main()
+    if len(sys.argv) > 1:
+        # Live mode, e.g. `python day01.py -` or `python day01.py localhost:9000`
+        asyncio.run(run_live_feed(sys.argv[1]))
+    else:
+        main()
@@ -2,6 +2,13 @@
 Advent of Code 2025 - Day 2: Gift Shop
 """
 
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+
 def is_invalid_id(num: int) -> bool:
     """
     Check if a number is invalid (made of some sequence repeated twice).
@@ -82,26 +89,185 @@ def parse_ranges(input_line: str) -> list[tuple[int, int]]:
     return ranges
 
 
-def find_invalid_ids_in_range(start: int, end: int) -> list[int]:
+def invalid_id_masks(ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
     """
-    Find all invalid IDs within a given range.
+    Check a block of IDs against both rule sets using integer arithmetic only.
+    
+    An n-digit ID is a pattern of length L repeated exactly when it is
+    divisible by (10^n - 1) / (10^L - 1).
+    
+    Args:
+        ids: Array of non-negative product IDs
+        
+    Returns:
+        Tuple of boolean masks (part 1 invalid, part 2 invalid)
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    powers_of_ten = 10 ** np.arange(19, dtype=np.int64)
+    num_digits = np.searchsorted(powers_of_ten, ids, side='right')
+    
+    part1 = np.zeros(ids.shape, dtype=bool)
+    part2 = np.zeros(ids.shape, dtype=bool)
+    
+    for n in np.unique(num_digits).tolist():
+        in_group = num_digits == n
+        
+        for pattern_len in range(1, n // 2 + 1):
+            if n % pattern_len != 0:
+                continue
+            
+            multiplier = (10 ** n - 1) // (10 ** pattern_len - 1)
+            repeated = in_group & (ids % multiplier == 0)
+            part2 |= repeated
+            if 2 * pattern_len == n:
+                part1 |= repeated
+    
+    return part1, part2
+
+
+def scan_invalid_ids(start: int, end: int, part: int = 1, block_size: int = 1 << 16) -> list[int]:
+    """
+    Enumerate a range in blocks and collect the invalid IDs with invalid_id_masks.
     
     Args:
         start: Start of range (inclusive)
         end: End of range (inclusive)
+        part: 1 or 2 to select the rules
+        block_size: Number of IDs to check per block
         
     Returns:
         List of invalid IDs in the range
     """
     invalid_ids = []
     
-    for num in range(start, end + 1):
-        if is_invalid_id(num):
-            invalid_ids.append(num)
+    for block_start in range(start, end + 1, block_size):
+        ids = np.arange(block_start, min(block_start + block_size, end + 1), dtype=np.int64)
+        masks = invalid_id_masks(ids)
+        invalid_ids.extend(ids[masks[part - 1]].tolist())
     
     return invalid_ids
 
 
+def is_invalid_id_block(ids: np.ndarray) -> np.ndarray:
+    """Part 1 predicate over a block of IDs (picklable for worker processes)."""
+    return invalid_id_masks(ids)[0]
+
+
+def is_invalid_id_block_v2(ids: np.ndarray) -> np.ndarray:
+    """Part 2 predicate over a block of IDs (picklable for worker processes)."""
+    return invalid_id_masks(ids)[1]
+
+
+def shard_ranges(ranges: list[tuple[int, int]], num_shards: int) -> list[tuple[int, int]]:
+    """
+    Split ranges into shards holding roughly the same number of IDs.
+    
+    Args:
+        ranges: List of (start, end) tuples
+        num_shards: Desired number of shards
+        
+    Returns:
+        List of (start, end) shards covering exactly the given ranges
+    """
+    total_ids = sum(end - start + 1 for start, end in ranges)
+    shard_size = max(1, -(-total_ids // max(1, num_shards)))
+    shards = []
+    
+    for start, end in ranges:
+        for shard_start in range(start, end + 1, shard_size):
+            shards.append((shard_start, min(shard_start + shard_size - 1, end)))
+    
+    return shards
+
+
+def sum_shard(start: int, end: int, predicate=is_invalid_id_block,
+              block_size: int = 1 << 16) -> tuple[int, int]:
+    """
+    Sum and count the IDs in a shard that match a block predicate.
+    
+    Args:
+        start: Start of shard (inclusive)
+        end: End of shard (inclusive)
+        predicate: Function mapping an int64 array of IDs to a boolean mask
+        block_size: Number of IDs to check per block
+        
+    Returns:
+        Tuple of (sum of matching IDs, number of matching IDs)
+    """
+    total = 0
+    count = 0
+    
+    for block_start in range(start, end + 1, block_size):
+        ids = np.arange(block_start, min(block_start + block_size, end + 1), dtype=np.int64)
+        matches = ids[predicate(ids)].tolist()
+        total += sum(matches)
+        count += len(matches)
+    
+    return total, count
+
+
+def print_progress(ids_done: int, total_ids: int, ids_per_second: float):
+    """Default progress reporter for scan_ranges_parallel."""
+    print(f"Scanned {ids_done}/{total_ids} IDs ({ids_per_second:,.0f} IDs/s)", flush=True)
+
+
+def scan_ranges_parallel(ranges: list[tuple[int, int]], predicate=is_invalid_id_block,
+                         max_workers: int | None = None, shards_per_worker: int = 4,
+                         report_progress=print_progress) -> tuple[int, int]:
+    """
+    Enumerate all ranges in a process pool, balancing shards by ID count.
+    
+    Args:
+        ranges: List of (start, end) tuples
+        predicate: Module-level function mapping an int64 array of IDs to a boolean mask
+        max_workers: Number of worker processes (defaults to the CPU count)
+        shards_per_worker: Number of shards to create per worker
+        report_progress: Callback receiving (ids_done, total_ids, ids_per_second)
+            after every finished shard, or None to disable reporting
+        
+    Returns:
+        Tuple of (sum of matching IDs, number of matching IDs)
+    """
+    max_workers = max_workers or os.cpu_count() or 1
+    shards = shard_ranges(ranges, max_workers * shards_per_worker)
+    total_ids = sum(end - start + 1 for start, end in shards)
+    
+    total = 0
+    count = 0
+    ids_done = 0
+    started = time.perf_counter()
+    
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(sum_shard, start, end, predicate): end - start + 1
+                   for start, end in shards}
+        
+        for future in as_completed(futures):
+            shard_total, shard_count = future.result()
+            total += shard_total
+            count += shard_count
+            ids_done += futures[future]
+            
+            if report_progress is not None:
+                elapsed = time.perf_counter() - started
+                report_progress(ids_done, total_ids, ids_done / elapsed if elapsed > 0 else 0.0)
+    
+    return total, count
+
+
+def find_invalid_ids_in_range(start: int, end: int) -> list[int]:
+    """
+    Find all invalid IDs within a given range.
+    
+    Args:
+        start: Start of range (inclusive)
+        end: End of range (inclusive)
+        
+    Returns:
+        List of invalid IDs in the range
+    """
+    return scan_invalid_ids(start, end, part=1)
+
+
 def find_invalid_ids_in_range_v2(start: int, end: int) -> list[int]:
     """
     Find all invalid IDs within a given range (Part 2 rules).
@@ -113,41 +279,302 @@ def find_invalid_ids_in_range_v2(start: int, end: int) -> list[int]:
     Returns:
         List of invalid IDs in the range
     """
-    invalid_ids = []
+    return scan_invalid_ids(start, end, part=2)
+
+
+def iter_ranges(input_file: str, chunk_size: int = 1 << 20):
+    """
+    Stream (start, end) tuples from a comma-separated ranges file.
     
-    for num in range(start, end + 1):
-        if is_invalid_id_v2(num):
-            invalid_ids.append(num)
+    The file is read in binary chunks, so the single input line is never held
+    in memory as a whole. A token split across two chunks is carried over to
+    the next one.
     
-    return invalid_ids
+    Args:
+        input_file: Path to the input file
+        chunk_size: Number of bytes to read at a time
+        
+    Yields:
+        (start, end) tuples
+    """
+    carry = b''
+    
+    with open(input_file, 'rb') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            
+            tokens = (carry + chunk).split(b',')
+            carry = tokens.pop()
+            
+            for token in tokens:
+                token = token.strip()
+                if b'-' in token:
+                    start, end = token.split(b'-', 1)
+                    yield int(start), int(end)
+    
+    carry = carry.strip()
+    if b'-' in carry:
+        start, end = carry.split(b'-', 1)
+        yield int(start), int(end)
 
 
-def solve_part1(input_file: str) -> int:
-    """Solve part 1 of the puzzle."""
-    with open(input_file, 'r') as f:
-        input_line = f.read().strip()
+def find_overlapping_ranges(ranges: list[tuple[int, int]]) -> list[tuple[tuple[int, int], tuple[int, int]]]:
+    """
+    Report ranges that overlap an earlier range (sorted by start).
+    
+    Each overlapping range is paired with the earlier range reaching furthest
+    to the right, so scanning both would check the shared IDs twice.
     
-    ranges = parse_ranges(input_line)
+    Args:
+        ranges: List of (start, end) tuples
+        
+    Returns:
+        List of (earlier_range, overlapping_range) pairs
+    """
+    overlaps = []
+    furthest = None
+    
+    for current in sorted(ranges):
+        if furthest is not None and current[0] <= furthest[1]:
+            overlaps.append((furthest, current))
+        if furthest is None or current[1] > furthest[1]:
+            furthest = current
+    
+    return overlaps
+
+
+def sum_repeated_ids(start: int, end: int, num_digits: int, pattern_len: int) -> int:
+    """
+    Sum all num_digits-digit IDs in a range that are a pattern of pattern_len digits repeated.
+    
+    Such an ID equals pattern * (10^num_digits - 1) / (10^pattern_len - 1), so
+    the IDs in the range form an arithmetic series over the pattern.
+    
+    Args:
+        start: Start of range (inclusive)
+        end: End of range (inclusive)
+        num_digits: Number of digits of the IDs
+        pattern_len: Length of the repeated pattern (must divide num_digits)
+        
+    Returns:
+        Sum of the matching IDs
+    """
+    multiplier = (10 ** num_digits - 1) // (10 ** pattern_len - 1)
+    
+    # Smallest and largest pattern whose repetition lies within the range
+    low = max(10 ** (pattern_len - 1), -(-start // multiplier))
+    high = min(10 ** pattern_len - 1, end // multiplier)
+    
+    if low > high:
+        return 0
+    
+    return multiplier * (low + high) * (high - low + 1) // 2
+
+
+def mobius(n: int) -> int:
+    """Möbius function of a positive integer."""
+    result = 1
+    factor = 2
+    while factor * factor <= n:
+        if n % factor == 0:
+            n //= factor
+            if n % factor == 0:
+                return 0
+            result = -result
+        factor += 1
+    if n > 1:
+        result = -result
+    return result
+
+
+def digit_length_ranges(start: int, end: int):
+    """
+    Split a range into sub-ranges whose IDs all have the same number of digits.
+    
+    Yields:
+        (num_digits, start, end) tuples
+    """
+    for num_digits in range(len(str(max(start, 1))), len(str(end)) + 1):
+        low = max(start, 10 ** (num_digits - 1))
+        high = min(end, 10 ** num_digits - 1)
+        if low <= high:
+            yield num_digits, low, high
+
+
+def sum_invalid_ids_in_range(start: int, end: int) -> int:
+    """
+    Sum all invalid IDs within a given range without enumerating it.
+    
+    Args:
+        start: Start of range (inclusive)
+        end: End of range (inclusive)
+        
+    Returns:
+        Sum of the invalid IDs in the range (same as sum(find_invalid_ids_in_range(start, end)))
+    """
     total = 0
     
-    for start, end in ranges:
-        invalid_ids = find_invalid_ids_in_range(start, end)
-        total += sum(invalid_ids)
+    for num_digits, low, high in digit_length_ranges(start, end):
+        if num_digits % 2 == 0:
+            total += sum_repeated_ids(low, high, num_digits, num_digits // 2)
     
     return total
 
 
-def solve_part2(input_file: str) -> int:
-    """Solve part 2 of the puzzle."""
-    with open(input_file, 'r') as f:
-        input_line = f.read().strip()
+def sum_invalid_ids_in_range_v2(start: int, end: int) -> int:
+    """
+    Sum all invalid IDs within a given range without enumerating it (Part 2 rules).
     
-    ranges = parse_ranges(input_line)
+    An ID whose shortest repeating pattern has length d is also a repetition of
+    every multiple of d dividing its length. Möbius inversion over the divisors
+    turns the per-pattern-length sums into sums over the shortest pattern
+    length, so that every ID is counted exactly once.
+    
+    Args:
+        start: Start of range (inclusive)
+        end: End of range (inclusive)
+        
+    Returns:
+        Sum of the invalid IDs in the range (same as sum(find_invalid_ids_in_range_v2(start, end)))
+    """
     total = 0
     
-    for start, end in ranges:
-        invalid_ids = find_invalid_ids_in_range_v2(start, end)
-        total += sum(invalid_ids)
+    for num_digits, low, high in digit_length_ranges(start, end):
+        divisors = [d for d in range(1, num_digits) if num_digits % d == 0]
+        repeated_sums = {d: sum_repeated_ids(low, high, num_digits, d) for d in divisors}
+        
+        for shortest in divisors:
+            total += sum(mobius(shortest // d) * repeated_sums[d]
+                         for d in divisors if shortest % d == 0)
+    
+    return total
+
+
+def generate_invalid_ids(max_digits: int, part: int = 1) -> np.ndarray:
+    """
+    Generate all invalid IDs with at most max_digits digits.
+    
+    Args:
+        max_digits: Largest number of digits to generate
+        part: 1 for pattern repeated twice, 2 for pattern repeated at least twice
+        
+    Returns:
+        Sorted int64 array of unique invalid IDs
+    """
+    blocks = []
+    
+    for num_digits in range(2, max_digits + 1):
+        if part == 1:
+            pattern_lens = [num_digits // 2] if num_digits % 2 == 0 else []
+        else:
+            pattern_lens = [d for d in range(1, num_digits) if num_digits % d == 0]
+        
+        for pattern_len in pattern_lens:
+            multiplier = (10 ** num_digits - 1) // (10 ** pattern_len - 1)
+            patterns = np.arange(10 ** (pattern_len - 1), 10 ** pattern_len, dtype=np.int64)
+            blocks.append(patterns * multiplier)
+    
+    if not blocks:
+        return np.zeros(0, dtype=np.int64)
+    
+    return np.unique(np.concatenate(blocks))
+
+
+class InvalidIdIndex:
+    """
+    Precomputed, memory-mapped index of all invalid IDs up to a digit bound.
+    
+    The index file holds a header [max_digits, count_part1, count_part2]
+    followed by, for each part, the sorted IDs and their prefix sums (with a
+    leading 0), all as int64. A range sum then takes two binary searches.
+    """
+    
+    def __init__(self, index_file: str):
+        """Memory-map an index created by InvalidIdIndex.build."""
+        header = np.fromfile(index_file, dtype=np.int64, count=3)
+        self.max_digits = int(header[0])
+        self.max_id = 10 ** self.max_digits - 1
+        
+        data = np.memmap(index_file, dtype=np.int64, mode='r', offset=header.nbytes)
+        self._ids = {}
+        self._prefix_sums = {}
+        offset = 0
+        
+        for part, count in ((1, int(header[1])), (2, int(header[2]))):
+            self._ids[part] = data[offset:offset + count]
+            self._prefix_sums[part] = data[offset + count:offset + 2 * count + 1]
+            offset += 2 * count + 1
+    
+    @staticmethod
+    def build(index_file: str, max_digits: int = 12):
+        """
+        Generate the invalid IDs for both parts and write the index file.
+        
+        Args:
+            index_file: Path of the index file to write
+            max_digits: Largest number of digits to cover
+        """
+        ids = {part: generate_invalid_ids(max_digits, part) for part in (1, 2)}
+        
+        # Prefix sums must fit into int64
+        largest_total = sum(int(value) for value in ids[2])
+        if largest_total > np.iinfo(np.int64).max:
+            raise ValueError(f"Sum of invalid IDs up to {max_digits} digits overflows int64")
+        
+        with open(index_file, 'wb') as f:
+            np.array([max_digits, len(ids[1]), len(ids[2])], dtype=np.int64).tofile(f)
+            for part in (1, 2):
+                prefix_sums = np.zeros(len(ids[part]) + 1, dtype=np.int64)
+                np.cumsum(ids[part], out=prefix_sums[1:])
+                ids[part].tofile(f)
+                prefix_sums.tofile(f)
+    
+    def sum_in_range(self, start: int, end: int, part: int = 1) -> int:
+        """
+        Sum all invalid IDs within a given range.
+        
+        Args:
+            start: Start of range (inclusive)
+            end: End of range (inclusive)
+            part: 1 or 2 to select the rules
+            
+        Returns:
+            Sum of the invalid IDs in the range
+        """
+        if end > self.max_id:
+            raise ValueError(f"Range end {end} exceeds the index bound of {self.max_digits} digits")
+        
+        ids = self._ids[part]
+        low = np.searchsorted(ids, start, side='left')
+        high = np.searchsorted(ids, end, side='right')
+        
+        return int(self._prefix_sums[part][high] - self._prefix_sums[part][low])
+
+
+def solve_part1(input_file: str, index: InvalidIdIndex | None = None) -> int:
+    """Solve part 1 of the puzzle, optionally using a precomputed index."""
+    total = 0
+    
+    for start, end in iter_ranges(input_file):
+        if index is not None:
+            total += index.sum_in_range(start, end, part=1)
+        else:
+            total += sum_invalid_ids_in_range(start, end)
+    
+    return total
+
+
+def solve_part2(input_file: str, index: InvalidIdIndex | None = None) -> int:
+    """Solve part 2 of the puzzle, optionally using a precomputed index."""
+    total = 0
+    
+    for start, end in iter_ranges(input_file):
+        if index is not None:
+            total += index.sum_in_range(start, end, part=2)
+        else:
+            total += sum_invalid_ids_in_range_v2(start, end)
     
     return total
 
@@ -178,6 +605,12 @@ def main():
     assert is_invalid_id_v2(824824824) == True, "824824824 should be invalid (v2)"
     assert is_invalid_id_v2(2121212121) == True, "2121212121 should be invalid (v2)"
     
+    # Vectorized predicate must agree with the string-based checks
+    sample_ids = np.arange(0, 200000, dtype=np.int64)
+    mask_part1, mask_part2 = invalid_id_masks(sample_ids)
+    assert mask_part1.tolist() == [is_invalid_id(num) for num in range(200000)], "Part 1 mask mismatch"
+    assert mask_part2.tolist() == [is_invalid_id_v2(num) for num in range(200000)], "Part 2 mask mismatch"
+    
     # Test Part 1 example
     ranges = parse_ranges(example)
     total = 0
@@ -188,6 +621,16 @@ def main():
     print(f"Example Part 1: {total}")
     assert total == 1227775554, f"Expected 1227775554, got {total}"
     
+    # Example ranges are disjoint
+    assert find_overlapping_ranges(ranges) == [], "Example ranges should not overlap"
+    assert find_overlapping_ranges([(1, 10), (20, 30), (5, 12)]) == [((1, 10), (5, 12))]
+    
+    # Sharded executor must agree with the sequential scan
+    shards = shard_ranges(ranges, 8)
+    assert sum(end - start + 1 for start, end in shards) == sum(end - start + 1 for start, end in ranges)
+    parallel_total, _ = scan_ranges_parallel(ranges, max_workers=2, report_progress=None)
+    assert parallel_total == total, f"Expected {total}, got {parallel_total}"
+    
     # Test Part 2 example
     total_v2 = 0
     for start, end in ranges:
@@ -197,6 +640,13 @@ def main():
     print(f"Example Part 2: {total_v2}")
     assert total_v2 == 4174379265, f"Expected 4174379265, got {total_v2}"
     
+    # Closed-form sums must match the enumeration
+    closed_form = sum(sum_invalid_ids_in_range(start, end) for start, end in ranges)
+    assert closed_form == total, f"Expected {total}, got {closed_form}"
+    
+    closed_form_v2 = sum(sum_invalid_ids_in_range_v2(start, end) for start, end in ranges)
+    assert closed_form_v2 == total_v2, f"Expected {total_v2}, got {closed_form_v2}"
+    
     # Solve actual puzzle
     try:
         result_part1 = solve_part1('../data/day02.txt')
@@ -204,6 +654,27 @@ def main():
         
         result_part2 = solve_part2('../data/day02.txt')
         print(f"Part 2 answer: {result_part2}")
+        
+        # Streaming tokenizer must handle tokens split across chunks
+        with open('../data/day02.txt', 'r') as f:
+            expected_ranges = parse_ranges(f.read())
+        assert list(iter_ranges('../data/day02.txt', chunk_size=5)) == expected_ranges, "Tokenizer mismatch"
+        
+        overlaps = find_overlapping_ranges(expected_ranges)
+        print(f"Overlapping ranges: {len(overlaps)}")
+        
+        # Precomputed index must agree with the closed form
+        import tempfile
+        with tempfile.NamedTemporaryFile(delete=False, suffix='.bin') as f:
+            index_file = f.name
+        
+        try:
+            InvalidIdIndex.build(index_file, max_digits=10)
+            index = InvalidIdIndex(index_file)
+            assert solve_part1('../data/day02.txt', index) == result_part1, "Index Part 1 mismatch"
+            assert solve_part2('../data/day02.txt', index) == result_part2, "Index Part 2 mismatch"
+        finally:
+            os.unlink(index_file)
     except FileNotFoundError:
         print("Input file not found. Please add your puzzle input to ../data/day02.txt")
 
@@ -1,8 +1,14 @@
-import matplotlib.pyplot as plt
 import numpy as np
-import imageio.v2 as imageio
+from PIL import Image
+import io
 import os
-import copy
+import tempfile
+import time
+import threading
+import multiprocessing
+import multiprocessing.connection
+from multiprocessing import shared_memory
+from collections import deque
 
 def count_adjacent_rolls(grid, row, col):
     """Count how many adjacent positions contain paper rolls."""
@@ -43,6 +49,424 @@ def count_accessible_rolls(grid):
     return accessible_count
 
 
+def grid_to_array(grid):
+    """Convert the grid to a uint8 array (1 for @) with a border of empty cells."""
+    rows = len(grid)
+    cols = len(grid[0])
+    padded = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+    cells = np.frombuffer(''.join(''.join(row) for row in grid).encode(), dtype=np.uint8)
+    padded[1:-1, 1:-1] = cells.reshape(rows, cols) == ord('@')
+    return padded
+
+
+def neighbor_directions(connectivity=8):
+    """Row and column offsets of the neighbors for 4- or 8-connectivity."""
+    if connectivity == 4:
+        return [(-1, 0), (0, -1), (0, 1), (1, 0)]
+    if connectivity == 8:
+        return [(dr, dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1) if dr or dc]
+    raise ValueError(f"Unsupported connectivity: {connectivity}")
+
+
+def neighbor_counts(padded, connectivity=8):
+    """Count the adjacent rolls of every cell using shifted slices."""
+    rows = padded.shape[0] - 2
+    cols = padded.shape[1] - 2
+    counts = np.zeros((rows, cols), dtype=np.uint8)
+    
+    for dr, dc in neighbor_directions(connectivity):
+        counts += padded[1 + dr:rows + 1 + dr, 1 + dc:cols + 1 + dc]
+    
+    return counts
+
+
+def count_accessible_rolls_vectorized(grid, threshold=4, connectivity=8):
+    """Vectorized version of count_accessible_rolls with a configurable access rule."""
+    padded = grid_to_array(grid)
+    rolls = padded[1:-1, 1:-1].astype(bool)
+    return int(np.count_nonzero(rolls & (neighbor_counts(padded, connectivity) < threshold)))
+
+
+def neighbor_count_histogram(grid, connectivity=8):
+    """Number of rolls with exactly 0, 1, ..., connectivity adjacent rolls."""
+    padded = grid_to_array(grid)
+    rolls = padded[1:-1, 1:-1].astype(bool)
+    counts = neighbor_counts(padded, connectivity)[rolls]
+    return np.bincount(counts, minlength=connectivity + 1)
+
+
+def count_accessible_rolls_all_thresholds(grid, connectivity=8):
+    """
+    Part 1 answers for every threshold from 1 to 8 from a single pass.
+    A roll is accessible under threshold t if it has fewer than t adjacent rolls.
+    Returns a dict mapping threshold to the number of accessible rolls.
+    """
+    cumulative = np.cumsum(neighbor_count_histogram(grid, connectivity))
+    return {threshold: int(cumulative[min(threshold, connectivity + 1) - 1])
+            for threshold in range(1, 9)}
+
+
+def iter_removal_rounds(grid, threshold=4, connectivity=8):
+    """
+    Peel accessible rolls round by round, like k-core peeling.
+    
+    Neighbor counts are computed once and only decremented around removed
+    rolls. A roll joins the next round exactly when its count drops below the
+    threshold, so every cell is visited a constant number of times.
+    Yields the list of (row, col) positions removed in each round, after the
+    round has been applied, so resuming the generator only does the work of
+    the next round.
+    """
+    padded = grid_to_array(grid)
+    width = padded.shape[1]
+    offsets = [dr * width + dc for dr, dc in neighbor_directions(connectivity)]
+    
+    alive = bytearray(padded.tobytes())
+    counts = np.zeros(padded.shape, dtype=np.uint8)
+    counts[1:-1, 1:-1] = neighbor_counts(padded, connectivity)
+    
+    frontier = np.flatnonzero(padded.ravel() & (counts.ravel() < threshold)).tolist()
+    counts = counts.ravel().tolist()
+    last_blocked = threshold - 1
+    
+    while frontier:
+        for index in frontier:
+            alive[index] = 0
+        
+        next_frontier = []
+        for index in frontier:
+            for offset in offsets:
+                neighbor = index + offset
+                if alive[neighbor]:
+                    counts[neighbor] -= 1
+                    if counts[neighbor] == last_blocked:
+                        next_frontier.append(neighbor)
+        
+        yield [(index // width - 1, index % width - 1) for index in frontier]
+        frontier = next_frontier
+
+
+def grid_to_bitboard(grid):
+    """
+    Pack the grid into a single int with one bit per cell.
+    
+    Cell (row, col) is bit row * stride + col, where stride = cols + 1 leaves
+    an always-empty guard column so that shifted rows never wrap into their
+    neighbors. Returns (board, stride).
+    """
+    stride = len(grid[0]) + 1
+    board = 0
+    
+    for row in reversed(grid):
+        bits = int(''.join(row)[::-1].replace('@', '1').replace('.', '0'), 2)
+        board = (board << stride) | bits
+    
+    return board, stride
+
+
+def full_adder(a, b, c):
+    """Add three bitboards bitwise, returning (sum, carry)."""
+    partial = a ^ b
+    return partial ^ c, (a & b) | (partial & c)
+
+
+def accessible_bitboard(board, stride):
+    """Bitboard of rolls with fewer than 4 adjacent rolls, using carry-save adders."""
+    up = board >> stride
+    down = board << stride
+    
+    # Eight neighbor planes reduced to a ones plane and four twos planes
+    ones_a, twos_a = full_adder(up << 1, up, up >> 1)
+    ones_b, twos_b = full_adder(down << 1, down, down >> 1)
+    ones_c, twos_c = (board << 1) ^ (board >> 1), (board << 1) & (board >> 1)
+    _, twos_d = full_adder(ones_a, ones_b, ones_c)
+    
+    # Four or more neighbors means at least two of the twos planes are set
+    at_least_four = ((twos_a & twos_b) | (twos_c & twos_d)
+                     | ((twos_a | twos_b) & (twos_c | twos_d)))
+    
+    return board & ~at_least_four
+
+
+def count_accessible_rolls_bitboard(grid):
+    """Bitboard version of count_accessible_rolls."""
+    board, stride = grid_to_bitboard(grid)
+    return accessible_bitboard(board, stride).bit_count()
+
+
+def remove_all_accessible_rolls_bitboard(grid):
+    """
+    Bitboard version of remove_all_accessible_rolls.
+    Each round removes all accessible rolls at once with a single mask.
+    """
+    board, stride = grid_to_bitboard(grid)
+    total_removed = 0
+    
+    while True:
+        accessible = accessible_bitboard(board, stride)
+        if not accessible:
+            break
+        board &= ~accessible
+        total_removed += accessible.bit_count()
+    
+    return total_removed
+
+
+def open_grid_file(input_file):
+    """
+    Memory-map a grid file without reading it.
+    Returns (data, rows, cols, row_length) where data is the flat uint8 map.
+    """
+    with open(input_file, 'rb') as f:
+        first_line = f.readline()
+    
+    cols = len(first_line.rstrip(b'\r\n'))
+    row_length = len(first_line) if first_line.endswith(b'\n') else len(first_line) + 1
+    data = np.memmap(input_file, dtype=np.uint8, mode='r')
+    rows = -(-len(data) // row_length)
+    return data, rows, cols, row_length
+
+
+def read_band(grid_file, start, stop):
+    """
+    Read rows [start, stop) of a memory-mapped grid as a zero-padded uint8 array.
+    The band includes a one-row halo above and below; halo rows outside the
+    grid are left empty.
+    """
+    data, rows, cols, row_length = grid_file
+    band = np.zeros((stop - start + 2, cols + 2), dtype=np.uint8)
+    first = max(start - 1, 0)
+    last = min(stop + 1, rows)
+    
+    for row in range(first, last):
+        offset = row * row_length
+        band[row - start + 1, 1:-1] = data[offset:offset + cols] == ord('@')
+    
+    return band
+
+
+def count_accessible_rolls_tiled(input_file, band_rows=1024):
+    """
+    Count accessible rolls in a grid file band by band.
+    Each band is read with a one-row halo above and below.
+    """
+    grid_file = open_grid_file(input_file)
+    rows = grid_file[1]
+    accessible_count = 0
+    
+    for start in range(0, rows, band_rows):
+        stop = min(start + band_rows, rows)
+        band = read_band(grid_file, start, stop)
+        counts = neighbor_counts(band)
+        accessible_count += int(np.count_nonzero(band[1:-1, 1:-1] & (counts < 4)))
+    
+    return accessible_count
+
+
+def remove_all_accessible_rolls_tiled(input_file, band_rows=1024, work_dir=None):
+    """
+    Remove accessible rolls from a grid file larger than memory.
+    
+    The grid is copied band by band into a memory-mapped working file that
+    also holds the frontier as per-cell marks: 1 is a roll, 2 a roll to be
+    removed in the next round, 3 a roll removed in the current round. Each
+    round only touches bands with marks and their direct neighbors, so memory
+    is bounded by the band size rather than by the grid or frontier size.
+    Returns the total number of rolls removed.
+    """
+    grid_file = open_grid_file(input_file)
+    rows, cols = grid_file[1], grid_file[2]
+    bands = [(start, min(start + band_rows, rows)) for start in range(0, rows, band_rows)]
+    
+    fd, work_file = tempfile.mkstemp(suffix='.grid', dir=work_dir)
+    os.close(fd)
+    
+    try:
+        state = np.memmap(work_file, dtype=np.uint8, mode='w+', shape=(rows + 2, cols + 2))
+        pending = set()
+        
+        # First round: copy the grid and mark the accessible rolls tile by tile
+        for i, (start, stop) in enumerate(bands):
+            band = read_band(grid_file, start, stop)
+            accessible = band[1:-1, 1:-1] & (neighbor_counts(band) < 4)
+            state[start + 1:stop + 1] = band[1:-1]
+            state[start + 1:stop + 1, 1:-1] += accessible
+            if accessible.any():
+                pending.add(i)
+        
+        total_removed = 0
+        removed_bands = set()
+        
+        while pending:
+            # Forget the previous round's removals, then remove the marked rolls
+            for i in removed_bands:
+                start, stop = bands[i]
+                inner = state[start + 1:stop + 1]
+                inner[inner == 3] = 0
+            
+            for i in pending:
+                start, stop = bands[i]
+                inner = state[start + 1:stop + 1]
+                marked = inner == 2
+                inner[marked] = 3
+                total_removed += int(np.count_nonzero(marked))
+            
+            # Rolls next to a removed roll may have become accessible
+            removed_bands = pending
+            pending = set()
+            affected = {j for i in removed_bands for j in (i - 1, i, i + 1) if 0 <= j < len(bands)}
+            
+            for i in sorted(affected):
+                start, stop = bands[i]
+                band = state[start:stop + 2]
+                rolls = ((band == 1) | (band == 2)).astype(np.uint8)
+                near_removed = neighbor_counts((band == 3).astype(np.uint8)) > 0
+                accessible = (band[1:-1, 1:-1] == 1) & near_removed & (neighbor_counts(rolls) < 4)
+                
+                if accessible.any():
+                    state[start + 1:stop + 1, 1:-1][accessible] = 2
+                    pending.add(i)
+        
+        del state
+    finally:
+        os.remove(work_file)
+    
+    return total_removed
+
+
+def removal_strip_worker(shm_name, shape, start, stop, barrier, round_counts, index):
+    """
+    Run removal rounds on grid rows [start, stop) held in shared memory.
+    
+    Halo rows of the neighboring strips are read straight from the shared
+    grid. The first barrier makes sure every strip has decided its removals
+    before any strip writes; the second publishes the per-strip removal
+    counts, whose sum tells all workers whether to stop.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    cells = np.ndarray(shape, dtype=np.uint8, buffer=shm.buf)
+    
+    strip = cells[start + 1:stop + 1, 1:-1]
+    
+    try:
+        while True:
+            counts = neighbor_counts(cells[start:stop + 2])
+            accessible = strip.astype(bool) & (counts < 4)
+            
+            barrier.wait()
+            strip[accessible] = 0
+            round_counts[index] = int(np.count_nonzero(accessible))
+            
+            barrier.wait()
+            if sum(round_counts) == 0:
+                break
+    except threading.BrokenBarrierError:
+        # Another strip failed; the parent reports the error
+        pass
+    except BaseException:
+        # Release the other strips instead of leaving them waiting forever
+        barrier.abort()
+        raise
+    
+    del cells, strip
+    shm.close()
+
+
+def remove_all_accessible_rolls_parallel(grid, workers=None):
+    """
+    Remove accessible rolls with one process per horizontal strip.
+    The padded grid lives in shared memory and workers synchronize at a
+    barrier between rounds. Returns the total number of rolls removed.
+    """
+    padded = grid_to_array(grid)
+    rows = padded.shape[0] - 2
+    workers = max(1, min(workers or os.cpu_count() or 1, rows))
+    
+    shm = shared_memory.SharedMemory(create=True, size=padded.nbytes)
+    try:
+        cells = np.ndarray(padded.shape, dtype=np.uint8, buffer=shm.buf)
+        cells[:] = padded
+        
+        barrier = multiprocessing.Barrier(workers)
+        round_counts = multiprocessing.Array('q', workers, lock=False)
+        bounds = [rows * i // workers for i in range(workers + 1)]
+        processes = [
+            multiprocessing.Process(
+                target=removal_strip_worker,
+                args=(shm.name, padded.shape, bounds[i], bounds[i + 1], barrier, round_counts, i),
+            )
+            for i in range(workers)
+        ]
+        
+        for process in processes:
+            process.start()
+        
+        # Abort the barrier as soon as any worker dies, even if it was killed
+        running = list(processes)
+        while running:
+            multiprocessing.connection.wait([process.sentinel for process in running])
+            running = [process for process in running if process.exitcode is None]
+            if any(process.exitcode for process in processes if process.exitcode is not None):
+                barrier.abort()
+        
+        if any(process.exitcode != 0 for process in processes):
+            raise RuntimeError("A strip worker failed")
+        
+        total_removed = int(padded.sum()) - int(cells.sum())
+        del cells
+    finally:
+        shm.close()
+        shm.unlink()
+    
+    return total_removed
+
+
+def removal_step_map(grid):
+    """
+    Record the round in which every roll is removed as an int16 array
+    (int32 for more than 32767 rounds).
+    Empty cells are -1, rolls that are never removed are 0, and a roll removed
+    in round k is k. This replaces full grid snapshots per round.
+    """
+    rolls = grid_to_array(grid)[1:-1, 1:-1].astype(bool)
+    step_map = np.where(rolls, 0, -1).astype(np.int16)
+    
+    for step, positions in enumerate(iter_removal_rounds(grid), start=1):
+        removed_rows, removed_cols = zip(*positions)
+        step_map = record_step(step_map, list(removed_rows), list(removed_cols), step)
+    
+    return step_map
+
+
+def record_step(step_map, removed_rows, removed_cols, step):
+    """
+    Mark the removed positions with their round in a step map.
+    The map is widened from int16 to int32 once the round no longer fits, so
+    it is returned and may be a new array.
+    """
+    if step > np.iinfo(step_map.dtype).max:
+        step_map = step_map.astype(np.int32)
+    
+    step_map[removed_rows, removed_cols] = step
+    return step_map
+
+
+def grid_at_step(step_map, step):
+    """Rebuild the grid (list of strings) after the given number of rounds."""
+    return rolls_to_grid((step_map == 0) | (step_map > step))
+
+
+def iter_grid_states(step_map):
+    """Lazily yield (grid, step) for the initial state and every round."""
+    for step in range(int(step_map.max(initial=0)) + 1):
+        yield grid_at_step(step_map, step), step
+
+
+def removals_per_step(step_map):
+    """Number of rolls removed in each round, starting with round 1."""
+    return np.bincount(step_map[step_map > 0].astype(np.int64))[1:].tolist()
+
+
 def print_grid(grid, step=None):
     """Print the grid with optional step information."""
     if step is not None:
@@ -51,168 +475,309 @@ def print_grid(grid, step=None):
         print(''.join(row))
 
 
-def remove_all_accessible_rolls(grid, visualize=False):
+def remove_all_accessible_rolls(grid, visualize=False, workers=None):
     """
     Iteratively remove accessible rolls until no more can be removed.
+    With workers set, rounds run in parallel via remove_all_accessible_rolls_parallel,
+    which cannot visualize the rounds.
     Returns the total number of rolls removed.
     """
-    # Convert grid to a mutable list of lists
-    grid = [list(row) for row in grid]
-    total_removed = 0
-    step = 0
+    if workers and visualize:
+        raise ValueError("visualize cannot be combined with workers")
     
-    if visualize:
-        print("Initial state:")
-        print_grid(grid)
+    if workers:
+        return remove_all_accessible_rolls_parallel(grid, workers)
     
-    while True:
-        # Find all accessible rolls in current state
-        accessible_positions = []
-        rows = len(grid)
-        cols = len(grid[0])
-        
-        for row in range(rows):
-            for col in range(cols):
-                if grid[row][col] == '@':
-                    if count_adjacent_rolls(grid, row, col) < 4:
-                        accessible_positions.append((row, col))
-        
-        # If no accessible rolls, we're done
-        if not accessible_positions:
-            if visualize:
-                print(f"\nNo more accessible rolls. Total removed: {total_removed}")
-            break
+    observers = [PrintObserver()] if visualize else []
+    return simulate_removal(grid, observers)
+
+
+FRAME_PALETTE = [247, 251, 255, 8, 48, 107, 0, 0, 0]
+
+
+def frame_cell_size(rows, cols, max_pixels=800):
+    """Pick a cell size in pixels so that frames stay around max_pixels wide."""
+    return max(1, max_pixels // max(rows, cols))
+
+
+def render_frame(rolls, cell_size):
+    """
+    Rasterize a boolean roll matrix straight into a frame of FRAME_PALETTE indices.
+    Rolls are dark blue, empty cells light blue, and black grid lines are
+    drawn when cells are at least 3 pixels wide.
+    """
+    frame = rolls.astype(np.uint8)
+    frame = np.repeat(np.repeat(frame, cell_size, axis=0), cell_size, axis=1)
+    
+    if cell_size >= 3:
+        frame[::cell_size, :] = 2
+        frame[:, ::cell_size] = 2
+        frame = np.pad(frame, ((0, 1), (0, 1)), constant_values=2)
+    
+    return frame
+
+
+def render_step_frame(step_map, step, cell_size):
+    """Render the frame after the given number of rounds from a removal step map."""
+    return render_frame((step_map == 0) | (step_map > step), cell_size)
+
+
+def encode_gif_frame(frame):
+    """Encode a frame of palette indices as a standalone single-image GIF."""
+    image = Image.fromarray(frame, mode='P')
+    image.putpalette(FRAME_PALETTE)
+    buffer = io.BytesIO()
+    image.save(buffer, format='GIF', optimize=False)
+    return buffer.getvalue()
+
+
+class GifStreamWriter:
+    """
+    Write an animated GIF one frame at a time.
+    
+    Each frame is LZW-encoded on its own (see encode_gif_frame) and its image
+    block is spliced into the output file right away, so only the frame being
+    written is ever held in memory.
+    """
+    
+    def __init__(self, output_filename, duration=1.0, loop=0):
+        self.file = open(output_filename, 'wb')
+        self.delay = round(duration * 100)
+        self.loop = loop
+        self.header_written = False
+    
+    def append(self, frame):
+        """Append a frame of FRAME_PALETTE indices."""
+        self.append_encoded(encode_gif_frame(frame))
+    
+    def append_encoded(self, data):
+        """Append a frame already encoded by encode_gif_frame."""
+        if not self.header_written:
+            # Logical screen without a global color table, then the loop extension
+            self.file.write(b'GIF89a' + data[6:10] + bytes([0, 0, 0]))
+            self.file.write(b'\x21\xff\x0bNETSCAPE2.0\x03\x01'
+                            + self.loop.to_bytes(2, 'little') + b'\x00')
+            self.header_written = True
         
-        # Remove all accessible rolls
-        for row, col in accessible_positions:
-            grid[row][col] = '.'
+        flags = data[10]
+        offset = 13
+        color_table = b''
+        if flags & 0x80:
+            color_table = data[offset:offset + 3 * (2 << (flags & 7))]
+            offset += len(color_table)
         
-        total_removed += len(accessible_positions)
-        step += 1
+        # Skip any extensions Pillow wrote before the image descriptor
+        while data[offset] == 0x21:
+            offset += 2
+            while data[offset]:
+                offset += data[offset] + 1
+            offset += 1
+        
+        descriptor = bytearray(data[offset:offset + 10])
+        if color_table and not descriptor[9] & 0x80:
+            # Move the global color table into a local one for this frame
+            descriptor[9] |= 0x80 | (flags & 7)
+        else:
+            color_table = b''
         
-        if visualize:
-            print(f"\nRemoved {len(accessible_positions)} rolls (total: {total_removed})")
-            print_grid(grid, step)
+        self.file.write(b'\x21\xf9\x04\x00' + self.delay.to_bytes(2, 'little') + b'\x00\x00')
+        self.file.write(bytes(descriptor) + color_table)
+        self.file.write(data[offset + 10:data.rindex(b'\x3b')])
     
-    return total_removed
+    def close(self):
+        self.file.write(b'\x3b')
+        self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
 
 
-def create_grid_image(grid, step, filename):
-    """Create an image of the grid for GIF creation."""
-    rows = len(grid)
-    cols = len(grid[0])
+def create_gif_from_grids(grid_states, output_filename='paper_rolls_removal.gif', cell_size=None):
+    """Create a GIF from an iterable of (grid, step) states, streaming one frame at a time."""
+    with GifStreamWriter(output_filename) as writer:
+        for grid, step in grid_states:
+            rolls = grid_to_array(grid)[1:-1, 1:-1].astype(bool)
+            writer.append(render_frame(rolls, cell_size or frame_cell_size(*rolls.shape)))
     
-    # Create a binary matrix (1 for @, 0 for .)
-    matrix = np.zeros((rows, cols))
-    for i in range(rows):
-        for j in range(cols):
-            if grid[i][j] == '@':
-                matrix[i][j] = 1
+    print(f"GIF saved as {output_filename}")
+
+
+frame_worker_state = {}
+
+
+def init_frame_worker(step_map, cell_size):
+    """Pool initializer: keep the step map in the worker so each task only sends a step."""
+    frame_worker_state['step_map'] = step_map
+    frame_worker_state['cell_size'] = cell_size
+
+
+def encode_step_frame(step):
+    """Render and encode the frame after the given number of rounds in a pool worker."""
+    return encode_gif_frame(render_step_frame(frame_worker_state['step_map'], step,
+                                              frame_worker_state['cell_size']))
+
+
+def write_gif_from_step_map(step_map, output_filename='paper_rolls_removal.gif',
+                            cell_size=None, workers=None):
+    """
+    Create a GIF of the removal process from a removal step map.
+    Frames are written as soon as they are encoded; with workers set they are
+    rendered and encoded in a process pool, at most two frames per worker
+    ahead of the writer.
+    """
+    cell_size = cell_size or frame_cell_size(*step_map.shape)
+    steps = range(int(step_map.max(initial=0)) + 1)
     
-    # Create figure with fixed size for consistent GIF frames
-    fig, ax = plt.subplots(figsize=(8, 8))
-    ax.imshow(matrix, cmap='Blues', interpolation='nearest')
+    with GifStreamWriter(output_filename) as writer:
+        if workers:
+            with multiprocessing.Pool(workers, init_frame_worker, (step_map, cell_size)) as pool:
+                pending = deque()
+                for step in steps:
+                    if len(pending) == 2 * workers:
+                        writer.append_encoded(pending.popleft().get())
+                    pending.append(pool.apply_async(encode_step_frame, (step,)))
+                while pending:
+                    writer.append_encoded(pending.popleft().get())
+        else:
+            for step in steps:
+                writer.append(render_step_frame(step_map, step, cell_size))
     
-    # Add grid lines
-    ax.set_xticks(np.arange(-0.5, cols, 1), minor=True)
-    ax.set_yticks(np.arange(-0.5, rows, 1), minor=True)
-    ax.grid(which='minor', color='black', linestyle='-', linewidth=0.5)
-    ax.tick_params(which='minor', size=0)
+    print(f"GIF saved as {output_filename}")
+
+
+def rolls_to_grid(rolls):
+    """Convert a boolean roll matrix back to a list of strings."""
+    cells = np.where(rolls, ord('@'), ord('.')).astype(np.uint8)
+    return [row.tobytes().decode() for row in cells]
+
+
+class PrintObserver:
+    """Print the grid before the first round and after every round."""
     
-    # Remove axis labels
-    ax.set_xticklabels([])
-    ax.set_yticklabels([])
+    def on_start(self, rolls, connectivity):
+        self.total_removed = 0
+        print("Initial state:")
+        print_grid(rolls_to_grid(rolls))
     
-    # Add title
-    if step == 0:
-        ax.set_title(f'Initial State', fontsize=14, pad=10)
-    else:
-        ax.set_title(f'Step {step}', fontsize=14, pad=10)
+    def on_round(self, step, removed_rows, removed_cols, rolls, seconds):
+        self.total_removed += len(removed_rows)
+        print(f"\nRemoved {len(removed_rows)} rolls (total: {self.total_removed})")
+        print_grid(rolls_to_grid(rolls), step)
     
-    plt.tight_layout()
-    plt.savefig(filename, dpi=100, bbox_inches='tight')
-    plt.close()
+    def on_finish(self, total_removed):
+        print(f"\nNo more accessible rolls. Total removed: {total_removed}")
 
 
-def create_gif_from_grids(grid_states, output_filename='paper_rolls_removal.gif'):
-    """Create a GIF from a list of grid states."""
-    filenames = []
+class GifObserver:
+    """Record a removal step map and write it as a GIF at the end."""
     
-    # Create directory for temporary images
-    os.makedirs('temp_images', exist_ok=True)
+    def __init__(self, output_filename='paper_rolls_removal.gif', workers=None):
+        self.output_filename = output_filename
+        self.workers = workers
     
-    # Create image for each step
-    for i, (grid, step) in enumerate(grid_states):
-        filename = f'temp_images/step_{i:02d}.png'
-        create_grid_image(grid, step, filename)
-        filenames.append(filename)
+    def on_start(self, rolls, connectivity):
+        self.step_map = np.where(rolls, 0, -1).astype(np.int16)
     
-    # Create GIF
-    images = []
-    for filename in filenames:
-        images.append(imageio.imread(filename))
+    def on_round(self, step, removed_rows, removed_cols, rolls, seconds):
+        self.step_map = record_step(self.step_map, removed_rows, removed_cols, step)
     
-    # Save GIF with slower frame rate for better viewing
-    imageio.mimsave(output_filename, images, duration=1.0, loop=0)
+    def on_finish(self, total_removed):
+        write_gif_from_step_map(self.step_map, self.output_filename, workers=self.workers)
+
+
+class MetricsObserver:
+    """
+    Collect per-round metrics: rolls removed, frontier size (surviving rolls
+    next to a removed one, i.e. the cells whose neighbor counts changed),
+    rolls remaining and wall time of the round.
+    """
     
-    # Clean up temporary images
-    for filename in filenames:
-        os.remove(filename)
-    os.rmdir('temp_images')
+    def on_start(self, rolls, connectivity):
+        self.rows = []
+        self.row_offsets, self.col_offsets = np.array(neighbor_directions(connectivity)).T
     
-    print(f"GIF saved as {output_filename}")
+    def on_round(self, step, removed_rows, removed_cols, rolls, seconds):
+        height, width = rolls.shape
+        neighbor_rows = (removed_rows[:, None] + self.row_offsets).ravel()
+        neighbor_cols = (removed_cols[:, None] + self.col_offsets).ravel()
+        inside = ((neighbor_rows >= 0) & (neighbor_rows < height)
+                  & (neighbor_cols >= 0) & (neighbor_cols < width))
+        neighbors = neighbor_rows[inside] * width + neighbor_cols[inside]
+        frontier = np.unique(neighbors[rolls.ravel()[neighbors]])
+        
+        self.rows.append((step, len(removed_rows), len(frontier), int(np.count_nonzero(rolls)), seconds))
+    
+    def on_finish(self, total_removed):
+        pass
+    
+    def table(self):
+        """Format the collected metrics as a per-round timing table."""
+        lines = [f"{'step':>6} {'removed':>9} {'frontier':>9} {'remaining':>10} {'ms':>9}"]
+        for step, removed, frontier, remaining, seconds in self.rows:
+            lines.append(f"{step:>6} {removed:>9} {frontier:>9} {remaining:>10} {seconds * 1000:>9.3f}")
+        total_seconds = sum(row[4] for row in self.rows)
+        lines.append(f"Total: {len(self.rows)} rounds in {total_seconds * 1000:.3f} ms")
+        return '\n'.join(lines)
 
 
-def remove_all_accessible_rolls_with_gif(grid, create_gif=False):
+def simulate_removal(grid, observers=(), threshold=4, connectivity=8):
     """
-    Iteratively remove accessible rolls until no more can be removed.
-    Optionally creates a GIF of the process.
+    Run the removal rounds, notifying observers after every round.
+    
+    Observers implement on_start(rolls, connectivity), on_round(step,
+    removed_rows, removed_cols, rolls, seconds) and on_finish(total_removed),
+    where rolls is the boolean roll matrix after the round and seconds the
+    time spent finding and applying the round (round 1 also covers the
+    initial neighbor counts). Without observers only the peeling engine runs,
+    with no bookkeeping per round. A roll is accessible if it has fewer than
+    threshold adjacent rolls under the given connectivity.
     Returns the total number of rolls removed.
     """
-    # Convert grid to a mutable list of lists
-    grid = [list(row) for row in grid]
+    if not observers:
+        return sum(len(positions) for positions in iter_removal_rounds(grid, threshold, connectivity))
+    
+    rolls = grid_to_array(grid)[1:-1, 1:-1].astype(bool)
+    for observer in observers:
+        observer.on_start(rolls, connectivity)
+    
+    rounds = iter_removal_rounds(grid, threshold, connectivity)
     total_removed = 0
     step = 0
-    grid_states = []
-    
-    # Save initial state
-    if create_gif:
-        grid_states.append((copy.deepcopy(grid), 0))
     
     while True:
-        # Find all accessible rolls in current state
-        accessible_positions = []
-        rows = len(grid)
-        cols = len(grid[0])
-        
-        for row in range(rows):
-            for col in range(cols):
-                if grid[row][col] == '@':
-                    if count_adjacent_rolls(grid, row, col) < 4:
-                        accessible_positions.append((row, col))
-        
-        # If no accessible rolls, we're done
-        if not accessible_positions:
+        started = time.perf_counter()
+        positions = next(rounds, None)
+        if positions is None:
             break
         
-        # Remove all accessible rolls
-        for row, col in accessible_positions:
-            grid[row][col] = '.'
-        
-        total_removed += len(accessible_positions)
+        removed_rows, removed_cols = np.array(positions).T
+        rolls[removed_rows, removed_cols] = False
+        seconds = time.perf_counter() - started
+        total_removed += len(positions)
         step += 1
         
-        # Save state for GIF
-        if create_gif:
-            grid_states.append((copy.deepcopy(grid), step))
+        for observer in observers:
+            observer.on_round(step, removed_rows, removed_cols, rolls, seconds)
     
-    # Create GIF if requested
-    if create_gif:
-        create_gif_from_grids(grid_states)
+    for observer in observers:
+        observer.on_finish(total_removed)
     
     return total_removed
 
 
+def remove_all_accessible_rolls_with_gif(grid, create_gif=False):
+    """
+    Iteratively remove accessible rolls until no more can be removed.
+    Optionally creates a GIF of the process.
+    Returns the total number of rolls removed.
+    """
+    observers = [GifObserver()] if create_gif else []
+    return simulate_removal(grid, observers)
+
+
 def main():
     # Test with the example first
     example = [
@@ -230,9 +795,25 @@ def main():
     
     example_result_part1 = count_accessible_rolls(example)
     print(f"Part 1 - Accessible rolls (expected 13): {example_result_part1}")
+    assert count_accessible_rolls_vectorized(example) == example_result_part1
+    assert count_accessible_rolls_bitboard(example) == example_result_part1
     
     example_result_part2 = remove_all_accessible_rolls_with_gif(example, create_gif=False)
     print(f"Part 2 - Total removed (expected 43): {example_result_part2}")
+    assert remove_all_accessible_rolls_bitboard(example) == example_result_part2
+    
+    # All thresholds from one neighbor-count histogram
+    example_by_threshold = count_accessible_rolls_all_thresholds(example)
+    assert example_by_threshold[4] == example_result_part1
+    for threshold in (2, 6):
+        assert example_by_threshold[threshold] == count_accessible_rolls_vectorized(example, threshold)
+    assert simulate_removal(example, threshold=4) == example_result_part2
+    
+    # Compact removal history
+    example_steps = removal_step_map(example)
+    assert sum(removals_per_step(example_steps)) == example_result_part2
+    assert count_accessible_rolls(grid_at_step(example_steps, 0)) == example_result_part1
+    assert grid_at_step(example_steps, 0) == example
     
     # Read the actual input file
     with open('../data/day04.txt', 'r') as f:
@@ -241,10 +822,25 @@ def main():
     # Part 1: Count accessible rolls
     result_part1 = count_accessible_rolls(grid)
     print(f"Part 1 - Number of rolls accessible by forklift: {result_part1}")
+    assert count_accessible_rolls_vectorized(grid) == result_part1
+    assert count_accessible_rolls_bitboard(grid) == result_part1
     
     # Part 2: Total rolls that can be removed (without visualization for large grid)
     result_part2 = remove_all_accessible_rolls_with_gif(grid, create_gif=False)
     print(f"Part 2 - Total rolls that can be removed: {result_part2}")
+    assert remove_all_accessible_rolls_bitboard(grid) == result_part2
+    
+    # Per-round metrics from the unified engine
+    metrics = MetricsObserver()
+    assert simulate_removal(grid, [metrics]) == result_part2
+    print(f"Part 2 - Rounds: {len(metrics.rows)}, slowest round: {max(row[4] for row in metrics.rows) * 1000:.3f} ms")
+    
+    # Parallel strips with shared memory
+    assert remove_all_accessible_rolls(grid, workers=4) == result_part2
+    
+    # Out-of-core engines on the memory-mapped file
+    assert count_accessible_rolls_tiled('../data/day04.txt', band_rows=16) == result_part1
+    assert remove_all_accessible_rolls_tiled('../data/day04.txt', band_rows=16) == result_part2
 
 
 if __name__ == "__main__":
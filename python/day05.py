@@ -2,6 +2,9 @@
 Advent of Code 2025 - Day 5: Cafeteria
 """
 
+from array import array
+from bisect import bisect_right
+
 
 def parse_input(input_file: str) -> tuple[list[tuple[int, int]], list[int]]:
     """
@@ -61,11 +64,7 @@ def count_fresh_ingredients(fresh_ranges: list[tuple[int, int]], available_ids:
     Returns:
         Number of fresh ingredients
     """
-    fresh_count = 0
-    for ingredient_id in available_ids:
-        if is_fresh(ingredient_id, fresh_ranges):
-            fresh_count += 1
-    return fresh_count
+    return FreshIndex(fresh_ranges).count_fresh(available_ids)
 
 
 def merge_ranges(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
@@ -99,6 +98,78 @@ def merge_ranges(ranges: list[tuple[int, int]]) -> list[tuple[int, int]]:
     return merged
 
 
+class FreshIndex:
+    """
+    Sorted interval index over the merged fresh ranges.
+    
+    Starts and ends are stored in parallel int64 arrays, so a membership test
+    is a single binary search in O(log R). Bounds that do not fit in int64
+    fall back to plain lists.
+    """
+    
+    def __init__(self, fresh_ranges: list[tuple[int, int]]):
+        """
+        Build the index from (possibly overlapping) fresh ranges.
+        
+        Args:
+            fresh_ranges: List of (start, end) tuples for fresh ingredient ranges
+        """
+        merged = merge_ranges(fresh_ranges)
+        starts = [start for start, _ in merged]
+        ends = [end for _, end in merged]
+        
+        try:
+            self.starts = array('q', starts)
+            self.ends = array('q', ends)
+        except OverflowError:
+            self.starts = starts
+            self.ends = ends
+    
+    def __len__(self) -> int:
+        return len(self.starts)
+    
+    def __contains__(self, ingredient_id: int) -> bool:
+        """Check if an ingredient ID is fresh."""
+        i = bisect_right(self.starts, ingredient_id) - 1
+        return i >= 0 and ingredient_id <= self.ends[i]
+    
+    def count_fresh(self, available_ids: list[int]) -> int:
+        """
+        Count the fresh IDs with one binary search per ID.
+        
+        Args:
+            available_ids: List of ingredient IDs to check
+            
+        Returns:
+            Number of fresh ingredients
+        """
+        return sum(1 for ingredient_id in available_ids if ingredient_id in self)
+    
+    def count_fresh_sorted(self, sorted_ids: list[int]) -> int:
+        """
+        Count the fresh IDs by sweeping ranges and IDs together in O(R + N).
+        
+        Args:
+            sorted_ids: Ingredient IDs in ascending order
+            
+        Returns:
+            Number of fresh ingredients
+        """
+        fresh_count = 0
+        i = 0
+        
+        for ingredient_id in sorted_ids:
+            # Skip ranges that end before this ID
+            while i < len(self.ends) and self.ends[i] < ingredient_id:
+                i += 1
+            if i == len(self.ends):
+                break
+            if self.starts[i] <= ingredient_id:
+                fresh_count += 1
+        
+        return fresh_count
+
+
 def count_all_fresh_ids(fresh_ranges: list[tuple[int, int]]) -> int:
     """
     Count the total number of ingredient IDs that are considered fresh
@@ -159,6 +230,13 @@ def main():
         print(f"Example Part 1: {example_result}")
         assert example_result == 3, f"Expected 3, got {example_result}"
         
+        # Interval index: binary search and merge sweep must agree with the linear scan
+        example_ranges, example_ids = parse_input(example_file)
+        index = FreshIndex(example_ranges)
+        assert [ingredient_id in index for ingredient_id in example_ids] == \
+            [is_fresh(ingredient_id, example_ranges) for ingredient_id in example_ids]
+        assert index.count_fresh_sorted(sorted(example_ids)) == 3, "Merge sweep mismatch"
+        
         example_result_part2 = solve_part2(example_file)
         print(f"Example Part 2: {example_result_part2}")
         assert example_result_part2 == 14, f"Expected 14, got {example_result_part2}"